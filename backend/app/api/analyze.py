@@ -2,13 +2,22 @@
 API routes for plagiarism analysis endpoints.
 """
 
+import asyncio
+import hashlib
 import logging
+from typing import List, Union
+import numpy as np
+import orjson
+from cachetools import TTLCache
 from fastapi import APIRouter, HTTPException, status
+from fastapi.responses import Response
+from pydantic import BaseModel, Field
 from app.models.schema import (
     AnalyzeRequest, 
     AnalyzeResponse, 
     ModelsResponse, 
-    HealthResponse
+    HealthResponse,
+    SimilarityPair
 )
 from app.services.detection import detection_service
 from app.services.embeddings import embedding_service
@@ -20,43 +29,94 @@ logger = logging.getLogger(__name__)
 # Create router
 router = APIRouter()
 
-@router.post("/analyze", response_model=AnalyzeResponse)
-async def analyze_plagiarism(request: AnalyzeRequest):
+# Serialized /analyze responses keyed by request hash, bounded by total body size
+_response_cache: TTLCache = TTLCache(
+    maxsize=settings.RESPONSE_CACHE_MAX_BYTES,
+    ttl=settings.RESPONSE_CACHE_TTL,
+    getsizeof=len
+)
+
+class AnalyzeCompactResponse(BaseModel):
+    """Response of /analyze?compact=true (upper triangle instead of the full matrix)."""
+    similarity_upper: List[float] = Field(
+        ..., description="Upper triangle of the similarity matrix, row-major, diagonal excluded"
+    )
+    n_texts: int = Field(..., description="Number of texts (dimension of the full matrix)")
+    plagiarized_pairs: List[SimilarityPair]
+    model_used: str
+    threshold_used: float
+    total_comparisons: int
+    execution_time: float
+
+def _analyze_cache_key(request: AnalyzeRequest, compact: bool) -> bytes:
+    """Hash model, threshold, format and texts (in order, since indices appear in the response)."""
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(f"{request.model_key}\0{request.threshold!r}\0{compact}\0".encode("utf-8"))
+    for text in request.texts:
+        encoded = text.encode("utf-8")
+        digest.update(len(encoded).to_bytes(8, "little"))
+        digest.update(encoded)
+    return digest.digest()
+
+@router.post("/analyze", response_model=Union[AnalyzeResponse, AnalyzeCompactResponse])
+async def analyze_plagiarism(request: AnalyzeRequest, compact: bool = False):
     """
     Analyze texts for plagiarism using semantic similarity.
     
     Args:
         request: AnalyzeRequest containing texts, model_key, and threshold
+        compact: Return only the upper triangle of the symmetric similarity matrix
+            (row-major, diagonal excluded) as similarity_upper plus n_texts,
+            instead of the full similarity_matrix
         
     Returns:
         AnalyzeResponse with similarity matrix and plagiarized pairs
+            (AnalyzeCompactResponse when compact is set)
     """
     try:
         logger.info(f"Received analysis request for {len(request.texts)} texts")
         logger.info(f"Model: {request.model_key}, Threshold: {request.threshold}")
         
+        # Serve identical repeated requests from the response cache
+        cache_key = _analyze_cache_key(request, compact)
+        cached_body = _response_cache.get(cache_key)
+        if cached_body is not None:
+            logger.info("Serving analysis from response cache")
+            return Response(content=cached_body, media_type="application/json")
+        
         # Perform plagiarism analysis
-        similarity_matrix, plagiarized_pairs, metadata = detection_service.analyze_texts(
+        similarity_matrix, plagiarized_pairs, metadata = await detection_service.analyze_texts(
             texts=request.texts,
             model_key=request.model_key,
             threshold=request.threshold
         )
         
-        # Convert similarity matrix to list of lists for JSON serialization
-        similarity_matrix_list = similarity_matrix.tolist()
+        if compact:
+            # The matrix is symmetric with a unit diagonal; the upper triangle is enough
+            n_texts = similarity_matrix.shape[0]
+            matrix_fields = {
+                "similarity_upper": similarity_matrix[np.triu_indices(n_texts, k=1)],
+                "n_texts": n_texts
+            }
+        else:
+            matrix_fields = {"similarity_matrix": similarity_matrix}
         
-        # Create response
-        response = AnalyzeResponse(
-            similarity_matrix=similarity_matrix_list,
-            plagiarized_pairs=plagiarized_pairs,
-            model_used=metadata["model_used"],
-            threshold_used=metadata["threshold_used"],
-            total_comparisons=metadata["total_comparisons"],
-            execution_time=metadata["execution_time"]
-        )
+        # Serialize the similarity matrix straight from the ndarray with orjson,
+        # skipping the n^2 Python floats a .tolist() + validation round-trip creates
+        body = orjson.dumps({
+            **matrix_fields,
+            "plagiarized_pairs": [pair.model_dump() for pair in plagiarized_pairs],
+            "model_used": metadata["model_used"],
+            "threshold_used": metadata["threshold_used"],
+            "total_comparisons": metadata["total_comparisons"],
+            "execution_time": metadata["execution_time"]
+        }, option=orjson.OPT_SERIALIZE_NUMPY)
+        # Oversized bodies would evict most of the cache for one entry
+        if len(body) <= min(settings.RESPONSE_CACHE_MAX_ENTRY_BYTES, _response_cache.maxsize):
+            _response_cache[cache_key] = body
         
         logger.info(f"Analysis completed successfully in {metadata['execution_time']:.2f}s")
-        return response
+        return Response(content=body, media_type="application/json")
         
     except ValueError as e:
         logger.error(f"Validation error: {str(e)}")
@@ -124,7 +184,7 @@ async def health_check():
         models_loaded = False
         try:
             # Try to load the default model
-            embedding_service._load_model(settings.DEFAULT_MODEL)
+            await asyncio.to_thread(embedding_service._load_model, settings.DEFAULT_MODEL)
             models_loaded = True
         except Exception:
             models_loaded = False
@@ -159,7 +219,7 @@ async def analyze_plagiarism_detailed(request: AnalyzeRequest):
         logger.info(f"Received detailed analysis request for {len(request.texts)} texts")
         
         # Perform detailed plagiarism analysis
-        result = detection_service.detect_potential_plagiarism(
+        result = await detection_service.detect_potential_plagiarism(
             texts=request.texts,
             model_key=request.model_key,
             strict_threshold=0.85,
@@ -181,6 +241,44 @@ async def analyze_plagiarism_detailed(request: AnalyzeRequest):
             detail="An unexpected error occurred during detailed analysis"
         )
 
+@router.post("/analyze/pairs")
+async def analyze_plagiarism_pairs(request: AnalyzeRequest):
+    """
+    Find plagiarized pairs without returning the similarity matrix.
+    
+    Suited to large inputs: the matrix is scanned in cache-sized tiles and
+    never materialized.
+    
+    Args:
+        request: AnalyzeRequest containing texts, model_key, and threshold
+        
+    Returns:
+        Plagiarized pairs with analysis metadata
+    """
+    try:
+        logger.info(f"Received pairs-only analysis request for {len(request.texts)} texts")
+        
+        result = await detection_service.find_plagiarized_pairs(
+            texts=request.texts,
+            model_key=request.model_key,
+            threshold=request.threshold
+        )
+        
+        return result
+        
+    except ValueError as e:
+        logger.error(f"Validation error: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid input: {str(e)}"
+        )
+    except Exception as e:
+        logger.error(f"Unexpected error: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="An unexpected error occurred during pairs analysis"
+        )
+
 @router.post("/compare")
 async def compare_two_texts(
     text1: str,
@@ -205,7 +303,7 @@ async def compare_two_texts(
         logger.info("Received request to compare two texts")
         
         # Get detailed similarity report
-        result = detection_service.get_text_similarity_report(
+        result = await detection_service.get_text_similarity_report(
             text1=text1,
             text2=text2,
             model_key=model_key
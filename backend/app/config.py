@@ -3,7 +3,7 @@ Configuration module for the Plagiarism Detector backend.
 Contains hardcoded application settings.
 """
 
-from typing import List, Dict
+from typing import List, Dict, Optional
 
 class Settings:
     """Application settings with hardcoded values."""
@@ -16,6 +16,34 @@ class Settings:
     # Model Configuration
     DEFAULT_MODEL: str = "miniLM"
     SIMILARITY_THRESHOLD: float = 0.7
+    # Block size for tiled pair search (256x256 fp32 tiles fit in L2)
+    SIMILARITY_TILE_SIZE: int = 256
+    # Run similarity kernels on CUDA when available
+    SIMILARITY_USE_GPU: bool = True
+    # Use the Numba pair kernel on CPU (for deployments without a tuned BLAS)
+    SIMILARITY_USE_NUMBA: bool = False
+    # Pairs-only analysis uses an HNSW index (hnswlib) above this many texts
+    ANN_MIN_TEXTS: int = 2000
+    ANN_NEIGHBORS: int = 50
+    
+    # Embedding Configuration
+    EMBEDDING_BATCH_SIZE: int = 64
+    EMBEDDING_CACHE_SIZE: int = 100_000
+    # Run models in FP16 on GPU / dynamic int8 on CPU
+    MODEL_REDUCED_PRECISION: bool = True
+    
+    # Request Batching Configuration
+    BATCH_MAX_SIZE: int = 64
+    BATCH_MAX_WAIT_MS: float = 20.0
+    # Worker threads for model inference (None: 1 on GPU, CPU count otherwise)
+    INFERENCE_MAX_WORKERS: Optional[int] = None
+    
+    # Response Cache Configuration
+    # Total bytes of serialized responses kept (an n x n matrix is ~11 MB at n=1000)
+    RESPONSE_CACHE_MAX_BYTES: int = 256 * 1024 * 1024
+    # Responses larger than this are not cached
+    RESPONSE_CACHE_MAX_ENTRY_BYTES: int = 16 * 1024 * 1024
+    RESPONSE_CACHE_TTL: int = 3600  # seconds
     
     # Available Models Mapping
     MODELS: Dict[str, str] = {
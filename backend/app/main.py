@@ -2,6 +2,7 @@
 Main FastAPI application for the Plagiarism Detector backend.
 """
 
+import asyncio
 import logging
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
@@ -96,6 +97,14 @@ async def startup_event():
     logger.info(f"Available models: {settings.get_available_models()}")
     logger.info(f"Default model: {settings.DEFAULT_MODEL}")
     logger.info(f"Default threshold: {settings.SIMILARITY_THRESHOLD}")
+    
+    # Warm up the default model so the first request does not pay the load cost
+    from app.services.embeddings import embedding_service
+    try:
+        await asyncio.to_thread(embedding_service.warm_up, settings.DEFAULT_MODEL)
+    except Exception as e:
+        logger.warning(f"Failed to warm up default model: {str(e)}")
+    
     logger.info("API startup completed")
 
 # Shutdown event
@@ -106,6 +115,7 @@ async def shutdown_event():
     # Clean up resources if needed
     from app.services.embeddings import embedding_service
     embedding_service.clear_all_models()
+    embedding_service.clear_cache()
     logger.info("API shutdown completed")
 
 # Run the application
@@ -0,0 +1,121 @@
+"""
+Async request batcher for merging concurrent inference calls into one batch.
+"""
+
+import asyncio
+import logging
+from concurrent.futures import Executor
+from typing import Any, Callable, List, Optional, Sequence
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+class _PendingRequest:
+    """A queued submission awaiting its slice of a batch result."""
+    
+    def __init__(self, items: List[Any], future: asyncio.Future):
+        """Initialize the pending request."""
+        self.items = items
+        self.future = future
+
+class AsyncBatcher:
+    """Merges concurrent submissions into a single call to process_batch."""
+    
+    def __init__(
+        self, 
+        process_batch: Callable[[List[Any]], Sequence[Any]], 
+        max_batch_size: int = 64, 
+        max_wait_ms: float = 20.0, 
+        executor: Optional[Executor] = None
+    ):
+        """
+        Initialize the batcher.
+        
+        Args:
+            process_batch: Function mapping a list of items to a same-length result
+            max_batch_size: Number of items after which a batch is flushed immediately
+            max_wait_ms: Maximum time to wait for more submissions before flushing
+            executor: Executor that runs process_batch off the event loop
+                (None uses the loop's default executor)
+        """
+        self.process_batch = process_batch
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self.executor = executor
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+    
+    async def submit(self, items: List[Any]) -> Sequence[Any]:
+        """
+        Submit items and wait for their results.
+        
+        Args:
+            items: Items to process
+            
+        Returns:
+            Results for the submitted items, in order
+        """
+        if not items:
+            raise ValueError("No items submitted for batching")
+        
+        self._ensure_worker()
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put(_PendingRequest(list(items), future))
+        return await future
+    
+    def _ensure_worker(self) -> None:
+        """Start the background worker on the running event loop if needed."""
+        if self._worker is None or self._worker.done():
+            self._queue = asyncio.Queue()
+            self._worker = asyncio.get_running_loop().create_task(self._run())
+    
+    async def _run(self) -> None:
+        """Collect queued submissions into batches and process them."""
+        loop = asyncio.get_running_loop()
+        
+        while True:
+            batch = [await self._queue.get()]
+            batch_size = len(batch[0].items)
+            deadline = loop.time() + self.max_wait
+            
+            # Keep collecting until the batch is full or the wait window closes
+            while batch_size < self.max_batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    pending = await asyncio.wait_for(self._queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                batch.append(pending)
+                batch_size += len(pending.items)
+            
+            await self._flush(batch)
+    
+    async def _flush(self, batch: List[_PendingRequest]) -> None:
+        """
+        Process a batch and hand each request its slice of the results.
+        
+        Args:
+            batch: Pending requests to process together
+        """
+        all_items = [item for pending in batch for item in pending.items]
+        logger.info(f"Processing batch of {len(all_items)} items from {len(batch)} requests")
+        
+        try:
+            # Run the blocking batch function in the executor so the loop stays responsive
+            results = await asyncio.get_running_loop().run_in_executor(
+                self.executor, self.process_batch, all_items
+            )
+        except Exception as e:
+            for pending in batch:
+                if not pending.future.done():
+                    pending.future.set_exception(e)
+            return
+        
+        offset = 0
+        for pending in batch:
+            end = offset + len(pending.items)
+            if not pending.future.done():
+                pending.future.set_result(results[offset:end])
+            offset = end
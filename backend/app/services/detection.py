@@ -4,10 +4,11 @@ Detection service for plagiarism and clone detection logic.
 
 import logging
 import time
-from typing import List, Tuple
+from typing import Dict, List, Tuple
 import numpy as np
 from app.services.embeddings import embedding_service
 from app.services.similarity import similarity_service
+from app.config import settings
 from app.models.schema import SimilarityPair
 
 # Configure logging
@@ -21,7 +22,7 @@ class DetectionService:
         self.embedding_service = embedding_service
         self.similarity_service = similarity_service
     
-    def analyze_texts(
+    async def analyze_texts(
         self, 
         texts: List[str], 
         model_key: str = "miniLM", 
@@ -43,11 +44,8 @@ class DetectionService:
         logger.info(f"Starting plagiarism analysis for {len(texts)} texts")
         logger.info(f"Using model: {model_key}, threshold: {threshold}")
         
-        # Step 1: Generate embeddings
-        embeddings = self.embedding_service.generate_embeddings(texts, model_key)
-        
-        # Step 2: Calculate similarity matrix
-        similarity_matrix = self.similarity_service.calculate_similarity_matrix(embeddings)
+        # Steps 1-2: Generate embeddings and calculate similarity matrix
+        similarity_matrix = await self._matrix_only(texts, model_key)
         
         # Step 3: Find similar pairs
         similar_pairs_raw = self.similarity_service.find_similar_pairs(
@@ -60,21 +58,57 @@ class DetectionService:
         )
         
         # Step 5: Calculate metadata
-        execution_time = time.time() - start_time
-        total_comparisons = len(texts) * (len(texts) - 1) // 2
+        metadata = self._build_metadata(
+            similarity_matrix, model_key, threshold, start_time
+        )
+        
+        logger.info(f"Analysis completed in {metadata['execution_time']:.2f} seconds")
+        logger.info(f"Found {len(plagiarized_pairs)} plagiarized pairs")
+        
+        return similarity_matrix, plagiarized_pairs, metadata
+    
+    async def _matrix_only(self, texts: List[str], model_key: str) -> np.ndarray:
+        """
+        Generate embeddings and compute the similarity matrix for texts.
+        
+        Args:
+            texts: List of text strings to analyze
+            model_key: Model key to use for embeddings
+            
+        Returns:
+            NxN similarity matrix
+        """
+        embeddings = await self.embedding_service.generate_embeddings_async(texts, model_key)
+        return self.similarity_service.calculate_similarity_matrix(embeddings)
+    
+    def _build_metadata(
+        self, 
+        similarity_matrix: np.ndarray, 
+        model_key: str, 
+        threshold: float, 
+        start_time: float
+    ) -> dict:
+        """
+        Build the analysis metadata for a computed similarity matrix.
+        
+        Args:
+            similarity_matrix: NxN similarity matrix
+            model_key: Model key used for embeddings
+            threshold: Similarity threshold used
+            start_time: Analysis start timestamp
+            
+        Returns:
+            Metadata dictionary
+        """
+        n_texts = similarity_matrix.shape[0]
         
-        metadata = {
+        return {
             "model_used": model_key,
             "threshold_used": threshold,
-            "total_comparisons": total_comparisons,
-            "execution_time": execution_time,
+            "total_comparisons": n_texts * (n_texts - 1) // 2,
+            "execution_time": time.time() - start_time,
             "similarity_stats": self.similarity_service.get_similarity_statistics(similarity_matrix)
         }
-        
-        logger.info(f"Analysis completed in {execution_time:.2f} seconds")
-        logger.info(f"Found {len(plagiarized_pairs)} plagiarized pairs")
-        
-        return similarity_matrix, plagiarized_pairs, metadata
     
     def _create_similarity_pairs(
         self, 
@@ -93,17 +127,20 @@ class DetectionService:
         """
         similarity_pairs = []
         
+        # Create text previews (first 100 characters) once per text, not once per pair
+        previews: Dict[int, str] = {}
+        for index1, index2, _ in similar_pairs_raw:
+            for index in (index1, index2):
+                if index not in previews:
+                    previews[index] = self._create_text_preview(texts[index])
+        
         for index1, index2, similarity in similar_pairs_raw:
-            # Create text previews (first 100 characters)
-            text1_preview = self._create_text_preview(texts[index1])
-            text2_preview = self._create_text_preview(texts[index2])
-            
             similarity_pair = SimilarityPair(
                 index_1=index1,
                 index_2=index2,
                 similarity=float(similarity),
-                text_1_preview=text1_preview,
-                text_2_preview=text2_preview
+                text_1_preview=previews[index1],
+                text_2_preview=previews[index2]
             )
             
             similarity_pairs.append(similarity_pair)
@@ -135,7 +172,7 @@ class DetectionService:
         
         return truncated + "..."
     
-    def detect_potential_plagiarism(
+    async def detect_potential_plagiarism(
         self, 
         texts: List[str], 
         model_key: str = "miniLM",
@@ -154,14 +191,12 @@ class DetectionService:
         Returns:
             Dictionary with plagiarism analysis results
         """
-        similarity_matrix, _, metadata = self.analyze_texts(texts, model_key, moderate_threshold)
+        start_time = time.time()
+        similarity_matrix = await self._matrix_only(texts, model_key)
         
-        # Find pairs at different thresholds
-        strict_pairs = self.similarity_service.find_similar_pairs(
-            similarity_matrix, strict_threshold
-        )
-        moderate_pairs = self.similarity_service.find_similar_pairs(
-            similarity_matrix, moderate_threshold
+        # Find pairs at both thresholds in a single pass over the matrix
+        strict_pairs, moderate_pairs = self.similarity_service.find_similar_pairs_multi(
+            similarity_matrix, [strict_threshold, moderate_threshold]
         )
         
         # Create detailed pairs
@@ -172,10 +207,59 @@ class DetectionService:
             "high_confidence_plagiarism": strict_similarity_pairs,
             "moderate_confidence_plagiarism": moderate_similarity_pairs,
             "similarity_matrix": similarity_matrix.tolist(),
-            "metadata": metadata
+            "metadata": self._build_metadata(
+                similarity_matrix, model_key, moderate_threshold, start_time
+            )
+        }
+    
+    async def find_plagiarized_pairs(
+        self, 
+        texts: List[str], 
+        model_key: str = "miniLM", 
+        threshold: float = 0.7
+    ) -> dict:
+        """
+        Find plagiarized pairs without computing the full similarity matrix.
+        
+        Args:
+            texts: List of text strings to analyze
+            model_key: Model key to use for embeddings
+            threshold: Similarity threshold for clone detection
+            
+        Returns:
+            Dictionary with plagiarized pairs and analysis metadata
+        """
+        start_time = time.time()
+        
+        logger.info(f"Starting pairs-only analysis for {len(texts)} texts")
+        
+        embeddings = await self.embedding_service.generate_embeddings_async(texts, model_key)
+        
+        # Large corpora switch from exact all-pairs to approximate nearest-neighbour search
+        use_ann = (
+            len(texts) > settings.ANN_MIN_TEXTS
+            and self.similarity_service.ann_available()
+        )
+        if use_ann:
+            similar_pairs_raw = self.similarity_service.find_similar_pairs_ann(
+                embeddings, threshold, k=settings.ANN_NEIGHBORS
+            )
+        else:
+            similar_pairs_raw = self.similarity_service.find_similar_pairs_streaming(
+                embeddings, threshold, tile_size=settings.SIMILARITY_TILE_SIZE
+            )
+        plagiarized_pairs = self._create_similarity_pairs(similar_pairs_raw, texts)
+        
+        return {
+            "plagiarized_pairs": plagiarized_pairs,
+            "model_used": model_key,
+            "threshold_used": threshold,
+            "total_comparisons": len(texts) * (len(texts) - 1) // 2,
+            "execution_time": time.time() - start_time,
+            "approximate": use_ann
         }
     
-    def get_text_similarity_report(
+    async def get_text_similarity_report(
         self, 
         text1: str, 
         text2: str, 
@@ -192,19 +276,24 @@ class DetectionService:
         Returns:
             Dictionary with detailed similarity report
         """
-        texts = [text1, text2]
-        similarity_matrix, _, metadata = self.analyze_texts(texts, model_key, 0.0)
+        start_time = time.time()
         
-        similarity_score = similarity_matrix[0, 1]
+        # Two texts need a single dot product, not the full matrix pipeline
+        embeddings = await self.embedding_service.generate_embeddings_async(
+            [text1, text2], model_key
+        )
+        similarity_score = self.similarity_service.calculate_cosine_similarity(
+            embeddings[0], embeddings[1]
+        )
         
         return {
-            "similarity_score": float(similarity_score),
+            "similarity_score": similarity_score,
             "is_highly_similar": similarity_score >= 0.85,
             "is_moderately_similar": similarity_score >= 0.7,
             "text1_preview": self._create_text_preview(text1),
             "text2_preview": self._create_text_preview(text2),
             "model_used": model_key,
-            "analysis_time": metadata["execution_time"]
+            "analysis_time": time.time() - start_time
         }
 
 # Create global instance
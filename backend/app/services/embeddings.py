@@ -2,22 +2,50 @@
 Embeddings service for generating sentence embeddings using various models.
 """
 
+import hashlib
 import logging
-from typing import List, Dict, Optional
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Optional, Tuple
 import numpy as np
+import torch
 from sentence_transformers import SentenceTransformer
 from app.config import settings
+from app.services.batching import AsyncBatcher
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+def _inference_max_workers() -> int:
+    """Number of inference threads: one on GPU to avoid CUDA context contention."""
+    if settings.INFERENCE_MAX_WORKERS is not None:
+        return settings.INFERENCE_MAX_WORKERS
+    if torch.cuda.is_available():
+        return 1
+    return os.cpu_count() or 1
+
+# Bounded pool running model.encode off the FastAPI event loop
+inference_executor = ThreadPoolExecutor(
+    max_workers=_inference_max_workers(),
+    thread_name_prefix="inference"
+)
+
 class EmbeddingService:
     """Service for generating sentence embeddings."""
     
     def __init__(self):
         """Initialize the embedding service."""
         self._models: Dict[str, SentenceTransformer] = {}
+        # LRU cache of embeddings keyed by (model_key, text digest)
+        self._emb_cache: "OrderedDict[Tuple[str, bytes], np.ndarray]" = OrderedDict()
+        # Locks for state shared by inference threads
+        self._model_lock = threading.Lock()
+        self._cache_lock = threading.Lock()
+        # Per-model batchers merging concurrent requests into one encode call
+        self._batchers: Dict[str, AsyncBatcher] = {}
         self._model_info: Dict[str, Dict] = {
             "miniLM": {
                 "name": "all-MiniLM-L6-v2",
@@ -38,23 +66,47 @@ class EmbeddingService:
     
     def _load_model(self, model_key: str) -> SentenceTransformer:
         """Load a model if not already loaded."""
-        if model_key not in self._models:
-            model_name = settings.get_model_name(model_key)
-            logger.info(f"Loading model: {model_name} (key: {model_key})")
+        with self._model_lock:
+            if model_key not in self._models:
+                model_name = settings.get_model_name(model_key)
+                logger.info(f"Loading model: {model_name} (key: {model_key})")
+                
+                try:
+                    # Load with trust_remote_code=True for Jina models
+                    trust_remote = model_key == "jina-small"
+                    model = SentenceTransformer(
+                        model_name, 
+                        trust_remote_code=trust_remote
+                    )
+                    if settings.MODEL_REDUCED_PRECISION:
+                        model = self._reduce_precision(model)
+                    self._models[model_key] = model
+                    logger.info(f"Successfully loaded model: {model_key}")
+                except Exception as e:
+                    logger.error(f"Failed to load model {model_key}: {str(e)}")
+                    raise RuntimeError(f"Failed to load model {model_key}: {str(e)}")
+            
+            return self._models[model_key]
+    
+    @staticmethod
+    def _reduce_precision(model: SentenceTransformer) -> SentenceTransformer:
+        """
+        Convert a model to reduced precision for faster inference.
+        
+        Args:
+            model: Loaded FP32 model
             
-            try:
-                # Load with trust_remote_code=True for Jina models
-                trust_remote = model_key == "jina-small"
-                self._models[model_key] = SentenceTransformer(
-                    model_name, 
-                    trust_remote_code=trust_remote
-                )
-                logger.info(f"Successfully loaded model: {model_key}")
-            except Exception as e:
-                logger.error(f"Failed to load model {model_key}: {str(e)}")
-                raise RuntimeError(f"Failed to load model {model_key}: {str(e)}")
-        
-        return self._models[model_key]
+        Returns:
+            FP16 model on GPU, or a model with dynamically quantized int8 Linear layers on CPU
+        """
+        if model.device.type == "cuda":
+            logger.info("Converting model to FP16")
+            return model.half()
+        
+        logger.info("Quantizing model Linear layers to int8")
+        return torch.ao.quantization.quantize_dynamic(
+            model, {torch.nn.Linear}, dtype=torch.qint8
+        )
     
     def generate_embeddings(self, texts: List[str], model_key: str = "miniLM") -> np.ndarray:
         """
@@ -77,22 +129,139 @@ class EmbeddingService:
         # Load model
         model = self._load_model(model_key)
         
+        # Serve cached embeddings and collect the unique texts that still need encoding
+        keys = [self._cache_key(model_key, text) for text in texts]
+        embeddings = np.empty(
+            (len(texts), model.get_sentence_embedding_dimension()),
+            dtype=np.float32
+        )
+        missing: Dict[Tuple[str, bytes], List[int]] = {}
+        with self._cache_lock:
+            for i, key in enumerate(keys):
+                if key in missing:
+                    # Duplicate of a text already queued for encoding
+                    missing[key].append(i)
+                    continue
+                cached = self._emb_cache.get(key)
+                if cached is None:
+                    missing[key] = [i]
+                else:
+                    self._emb_cache.move_to_end(key)
+                    embeddings[i] = cached
+        
+        if not missing:
+            logger.info(f"All {len(texts)} embeddings served from cache")
+            return embeddings
+        
         # Generate embeddings
-        logger.info(f"Generating embeddings for {len(texts)} texts using {model_key}")
+        n_missing = sum(len(positions) for positions in missing.values())
+        logger.info(
+            f"Generating embeddings for {len(missing)} unique texts using {model_key} "
+            f"({len(texts) - n_missing} cached, {n_missing - len(missing)} duplicates)"
+        )
         try:
-            embeddings = model.encode(
-                texts,
+            encoded = model.encode(
+                [texts[positions[0]] for positions in missing.values()],
+                batch_size=settings.EMBEDDING_BATCH_SIZE,
                 convert_to_numpy=True,
                 normalize_embeddings=True,  # Normalize for cosine similarity
-                show_progress_bar=len(texts) > 10
-            )
-            
-            logger.info(f"Generated embeddings shape: {embeddings.shape}")
-            return embeddings
-            
+                show_progress_bar=len(missing) > 10
+            ).astype(np.float32, copy=False)
         except Exception as e:
             logger.error(f"Error generating embeddings: {str(e)}")
             raise RuntimeError(f"Failed to generate embeddings: {str(e)}")
+        
+        # Scatter each encoded embedding back to every position of its text
+        with self._cache_lock:
+            for (key, positions), embedding in zip(missing.items(), encoded):
+                embeddings[positions] = embedding
+                self._cache_put(key, embeddings[positions[0]].copy())
+        
+        logger.info(f"Generated embeddings shape: {embeddings.shape}")
+        return embeddings
+    
+    async def generate_embeddings_async(
+        self, 
+        texts: List[str], 
+        model_key: str = "miniLM"
+    ) -> np.ndarray:
+        """
+        Generate embeddings, batching concurrent requests for the same model.
+        
+        Cached texts are answered immediately; only uncached texts are batched.
+        
+        Args:
+            texts: List of text strings to embed
+            model_key: Model key to use for embeddings
+            
+        Returns:
+            numpy array of embeddings with shape (n_texts, embedding_dim)
+        """
+        if not texts:
+            raise ValueError("No texts provided for embedding generation")
+        
+        # Validate model key before creating a batcher for it
+        if model_key not in settings.get_available_models():
+            raise ValueError(f"Invalid model key: {model_key}")
+        
+        # Serve cached embeddings directly; only the misses wait for a batch window
+        keys = [self._cache_key(model_key, text) for text in texts]
+        cached = self._cache_lookup(keys)
+        missing: Dict[Tuple[str, bytes], str] = {}
+        for key, text, embedding in zip(keys, texts, cached):
+            if embedding is None:
+                missing.setdefault(key, text)
+        
+        if not missing:
+            logger.info(f"All {len(texts)} embeddings served from cache")
+            return np.stack(cached)
+        
+        if model_key not in self._batchers:
+            self._batchers[model_key] = AsyncBatcher(
+                process_batch=lambda batch: self.generate_embeddings(batch, model_key),
+                max_batch_size=settings.BATCH_MAX_SIZE,
+                max_wait_ms=settings.BATCH_MAX_WAIT_MS, 
+                executor=inference_executor
+            )
+        
+        encoded = await self._batchers[model_key].submit(list(missing.values()))
+        
+        # Each unique missing text was encoded once; fill in every position it occupies
+        encoded_by_key = dict(zip(missing, encoded))
+        return np.stack([
+            encoded_by_key[key] if embedding is None else embedding
+            for key, embedding in zip(keys, cached)
+        ])
+    
+    @staticmethod
+    def _cache_key(model_key: str, text: str) -> Tuple[str, bytes]:
+        """Build the embedding cache key for a text."""
+        digest = hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest()
+        return model_key, digest
+    
+    def _cache_lookup(self, keys: List[Tuple[str, bytes]]) -> List[Optional[np.ndarray]]:
+        """Return the cached embedding for each key (None on a miss), refreshing hits."""
+        hits = []
+        with self._cache_lock:
+            for key in keys:
+                cached = self._emb_cache.get(key)
+                if cached is not None:
+                    self._emb_cache.move_to_end(key)
+                hits.append(cached)
+        return hits
+    
+    def _cache_put(self, key: Tuple[str, bytes], embedding: np.ndarray) -> None:
+        """Store an embedding, evicting the least recently used entries (caller holds the lock)."""
+        self._emb_cache[key] = embedding
+        self._emb_cache.move_to_end(key)
+        while len(self._emb_cache) > settings.EMBEDDING_CACHE_SIZE:
+            self._emb_cache.popitem(last=False)
+    
+    def warm_up(self, model_key: str) -> None:
+        """Load a model and run a dummy encode so kernels and caches are initialized."""
+        model = self._load_model(model_key)
+        model.encode(["warmup"], convert_to_numpy=True)
+        logger.info(f"Warmed up model: {model_key}")
     
     def get_model_info(self, model_key: str) -> Dict:
         """Get information about a specific model."""
@@ -118,6 +287,12 @@ class EmbeddingService:
         """Clear all loaded models from memory."""
         self._models.clear()
         logger.info("Cleared all models from memory")
+    
+    def clear_cache(self) -> None:
+        """Clear all cached embeddings."""
+        with self._cache_lock:
+            self._emb_cache.clear()
+        logger.info("Cleared embedding cache")
 
 # Create global instance
 embedding_service = EmbeddingService() 
\ No newline at end of file
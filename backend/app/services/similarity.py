@@ -5,11 +5,101 @@ Similarity service for calculating cosine similarity between embeddings.
 import logging
 from typing import List, Tuple
 import numpy as np
-from scipy.spatial.distance import cosine
+import torch
+from app.config import settings
+
+try:
+    # Optional SIMD kernels (AVX2/AVX-512/NEON); falls back to NumPy when absent
+    import simsimd
+except ImportError:
+    simsimd = None
+
+try:
+    # Optional HNSW index for approximate pair search on large corpora
+    import hnswlib
+except ImportError:
+    hnswlib = None
+
+try:
+    # Optional JIT for CPU-only deployments without a tuned BLAS
+    from numba import njit, prange
+except ImportError:
+    njit = None
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
+if njit is not None:
+    # No fastmath: the count and fill passes must compute bit-identical scores,
+    # or the fill pass could spend a row's slots on a borderline pair
+    @njit(inline="always")
+    def _dot_kernel(embeddings, i, j):
+        """Dot product of two embedding rows, accumulated in a fixed order."""
+        s = np.float32(0.0)
+        for k in range(embeddings.shape[1]):
+            s += embeddings[i, k] * embeddings[j, k]
+        return s
+    
+    @njit(parallel=True, cache=True)
+    def _count_pairs_kernel(embeddings, threshold):
+        """Count, per row, the upper-triangle pairs above the threshold."""
+        n = embeddings.shape[0]
+        counts = np.zeros(n, dtype=np.int64)
+        for i in prange(n):
+            count = 0
+            for j in range(i + 1, n):
+                if _dot_kernel(embeddings, i, j) >= threshold:
+                    count += 1
+            counts[i] = count
+        return counts
+    
+    @njit(parallel=True, cache=True)
+    def _fill_pairs_kernel(embeddings, threshold, offsets, rows, cols, values):
+        """Write each row's pairs above the threshold into its slice of the outputs."""
+        n = embeddings.shape[0]
+        for i in prange(n):
+            pos = offsets[i]
+            end = offsets[i + 1]
+            for j in range(i + 1, n):
+                if pos >= end:
+                    break
+                s = _dot_kernel(embeddings, i, j)
+                if s >= threshold:
+                    rows[pos] = i
+                    cols[pos] = j
+                    values[pos] = s
+                    pos += 1
+    
+    def _find_pairs_numba(
+        embeddings: np.ndarray, 
+        threshold: np.float32
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Fused dot + threshold + upper-triangle scan without an NxN intermediate.
+        
+        Rows are processed in parallel; a counting pass sizes the outputs so that
+        the fill pass can write without synchronization.
+        
+        Args:
+            embeddings: Normalized float32 embeddings
+            threshold: Similarity threshold
+            
+        Returns:
+            Unsorted (rows, cols, values) arrays of pairs above the threshold
+        """
+        embeddings = np.ascontiguousarray(embeddings)
+        counts = _count_pairs_kernel(embeddings, threshold)
+        offsets = np.zeros(counts.shape[0] + 1, dtype=np.int64)
+        np.cumsum(counts, out=offsets[1:])
+        
+        total = int(offsets[-1])
+        rows = np.empty(total, dtype=np.int64)
+        cols = np.empty(total, dtype=np.int64)
+        values = np.empty(total, dtype=np.float32)
+        _fill_pairs_kernel(embeddings, threshold, offsets, rows, cols, values)
+        
+        return rows, cols, values
+
 class SimilarityService:
     """Service for calculating similarity between embeddings."""
     
@@ -27,41 +117,254 @@ class SimilarityService:
         if embeddings.size == 0:
             raise ValueError("Empty embeddings array provided")
         
+        # Cast once so BLAS dispatches to SGEMM rather than DGEMM
+        embeddings = np.asarray(embeddings, dtype=np.float32)
         n_texts = embeddings.shape[0]
-        similarity_matrix = np.zeros((n_texts, n_texts))
+        
+        similarity_matrix = np.empty((n_texts, n_texts), dtype=np.float32)
         
         logger.info(f"Calculating similarity matrix for {n_texts} texts")
         
-        # Calculate pairwise similarities
-        for i in range(n_texts):
-            for j in range(n_texts):
-                if i == j:
-                    # Diagonal elements are 1.0 (perfect similarity with self)
-                    similarity_matrix[i, j] = 1.0
-                elif i < j:
-                    # Calculate cosine similarity
-                    # Since embeddings are normalized, dot product = cosine similarity
-                    similarity = np.dot(embeddings[i], embeddings[j])
-                    similarity_matrix[i, j] = similarity
-                    similarity_matrix[j, i] = similarity  # Matrix is symmetric
+        embeddings = SimilarityService._normalize(embeddings)
+        
+        if SimilarityService._use_gpu():
+            # Tensor-core GEMM on the GPU; the finished matrix is copied straight
+            # into the preallocated host buffer (no second n x n host array)
+            device_embeddings = torch.from_numpy(embeddings).to("cuda")
+            torch.from_numpy(similarity_matrix).copy_(device_embeddings @ device_embeddings.T)
+        else:
+            # All pairwise similarities in a single matrix multiplication
+            np.matmul(embeddings, embeddings.T, out=similarity_matrix)
+        
+        # Diagonal elements are 1.0 (perfect similarity with self)
+        np.fill_diagonal(similarity_matrix, 1.0)
         
         logger.info("Similarity matrix calculation completed")
         return similarity_matrix
     
     @staticmethod
-    def calculate_cosine_similarity(vec1: np.ndarray, vec2: np.ndarray) -> float:
+    def _use_gpu() -> bool:
+        """Check whether similarity kernels should run on CUDA."""
+        return settings.SIMILARITY_USE_GPU and torch.cuda.is_available()
+    
+    @staticmethod
+    def _use_numba() -> bool:
+        """Check whether the Numba pair kernel should be used."""
+        return (
+            settings.SIMILARITY_USE_NUMBA
+            and njit is not None
+            and not SimilarityService._use_gpu()
+        )
+    
+    @staticmethod
+    def _normalize(embeddings: np.ndarray) -> np.ndarray:
+        """
+        Re-normalize embeddings defensively to unit length.
+        
+        Args:
+            embeddings: float32 array of embeddings with shape (n_texts, embedding_dim)
+            
+        Returns:
+            Normalized copy; for unit vectors the dot product is cosine similarity
+        """
+        norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+        return embeddings / np.clip(norms, 1e-12, None)
+    
+    @staticmethod
+    def find_similar_pairs_streaming(
+        embeddings: np.ndarray, 
+        threshold: float = 0.7, 
+        tile_size: int = 256
+    ) -> List[Tuple[int, int, float]]:
+        """
+        Find similar pairs directly from embeddings without materializing the NxN matrix.
+        
+        The matrix is computed in tile_size x tile_size blocks that fit in L2 cache,
+        and each block is thresholded as soon as it is produced.
+        
+        Args:
+            embeddings: numpy array of embeddings with shape (n_texts, embedding_dim)
+            threshold: Similarity threshold (0.0 to 1.0)
+            tile_size: Number of rows/columns per block
+            
+        Returns:
+            List of tuples (index1, index2, similarity_score), sorted like find_similar_pairs
+        """
+        if embeddings.size == 0:
+            raise ValueError("Empty embeddings array provided")
+        if not 0.0 <= threshold <= 1.0:
+            raise ValueError("Threshold must be between 0.0 and 1.0")
+        
+        embeddings = SimilarityService._normalize(
+            np.asarray(embeddings, dtype=np.float32)
+        )
+        n_texts = embeddings.shape[0]
+        
+        if SimilarityService._use_numba():
+            logger.info(f"Finding similar pairs for {n_texts} texts with the Numba kernel")
+            rows, cols, values = _find_pairs_numba(embeddings, np.float32(threshold))
+        else:
+            logger.info(f"Streaming similar pairs for {n_texts} texts in {tile_size}x{tile_size} tiles")
+            rows, cols, values = SimilarityService._find_pairs_tiled(
+                embeddings, threshold, tile_size
+            )
+        
+        # Sort by similarity score (descending), ties in upper-triangle order
+        order = np.lexsort((cols, rows, -values))
+        similar_pairs = list(zip(
+            rows[order].tolist(),
+            cols[order].tolist(),
+            values[order].tolist()
+        ))
+        
+        logger.info(f"Found {len(similar_pairs)} similar pairs above threshold {threshold}")
+        return similar_pairs
+    
+    @staticmethod
+    def ann_available() -> bool:
+        """Check whether approximate (HNSW) pair search is available."""
+        return hnswlib is not None
+    
+    @staticmethod
+    def find_similar_pairs_ann(
+        embeddings: np.ndarray, 
+        threshold: float = 0.7, 
+        k: int = 50
+    ) -> List[Tuple[int, int, float]]:
+        """
+        Find similar pairs approximately with an HNSW index instead of all-pairs comparison.
+        
+        Each text is matched only against its k nearest neighbours, so pairs are
+        missed when a text has more than k neighbours above the threshold.
+        
+        Args:
+            embeddings: numpy array of embeddings with shape (n_texts, embedding_dim)
+            threshold: Similarity threshold (0.0 to 1.0)
+            k: Number of nearest neighbours checked per text
+            
+        Returns:
+            List of tuples (index1, index2, similarity_score), sorted like find_similar_pairs
+        """
+        if hnswlib is None:
+            raise RuntimeError("hnswlib is not installed")
+        if embeddings.size == 0:
+            raise ValueError("Empty embeddings array provided")
+        if not 0.0 <= threshold <= 1.0:
+            raise ValueError("Threshold must be between 0.0 and 1.0")
+        
+        embeddings = np.asarray(embeddings, dtype=np.float32)
+        n_texts, dim = embeddings.shape
+        k = min(k + 1, n_texts)  # +1 because each text finds itself
+        
+        logger.info(f"Building HNSW index for {n_texts} texts (k={k - 1})")
+        
+        index = hnswlib.Index(space="cosine", dim=dim)
+        index.init_index(max_elements=n_texts, ef_construction=200, M=16)
+        index.add_items(embeddings, np.arange(n_texts))
+        index.set_ef(max(k, 50))
+        labels, distances = index.knn_query(embeddings, k=k)
+        
+        # Cosine distance to similarity, then keep hits and drop self-matches
+        rows = np.repeat(np.arange(n_texts), k)
+        cols = labels.ravel().astype(np.int64)
+        values = 1.0 - distances.ravel()
+        mask = (values >= threshold) & (rows != cols)
+        rows, cols, values = rows[mask], cols[mask], values[mask]
+        
+        # A pair may be found from both ends; keep one (i < j) copy of each
+        lo, hi = np.minimum(rows, cols), np.maximum(rows, cols)
+        _, first = np.unique(lo * n_texts + hi, return_index=True)
+        rows, cols, values = lo[first], hi[first], values[first]
+        
+        # Sort by similarity score (descending), ties in upper-triangle order
+        order = np.lexsort((cols, rows, -values))
+        similar_pairs = list(zip(
+            rows[order].tolist(),
+            cols[order].tolist(),
+            values[order].tolist()
+        ))
+        
+        logger.info(f"Found {len(similar_pairs)} similar pairs above threshold {threshold}")
+        return similar_pairs
+    
+    @staticmethod
+    def _find_pairs_tiled(
+        embeddings: np.ndarray, 
+        threshold: float, 
+        tile_size: int
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Threshold the upper triangle block by block with BLAS (or CUDA) GEMMs.
+        
+        Args:
+            embeddings: Normalized float32 embeddings
+            threshold: Similarity threshold
+            tile_size: Number of rows/columns per block
+            
+        Returns:
+            Unsorted (rows, cols, values) arrays of pairs above the threshold
+        """
+        n_texts = embeddings.shape[0]
+        
+        use_gpu = SimilarityService._use_gpu()
+        if use_gpu:
+            # Keep embeddings on the GPU; only the hits of each tile are transferred back
+            embeddings = torch.from_numpy(embeddings).to("cuda")
+        
+        rows_parts, cols_parts, values_parts = [], [], []
+        for i0 in range(0, n_texts, tile_size):
+            row_block = embeddings[i0:i0 + tile_size]
+            # Only blocks on or above the diagonal are needed
+            for j0 in range(i0, n_texts, tile_size):
+                block = row_block @ embeddings[j0:j0 + tile_size].T
+                if use_gpu:
+                    hits = torch.nonzero(block >= threshold)
+                    values = block[hits[:, 0], hits[:, 1]].cpu().numpy()
+                    rows, cols = hits.cpu().numpy().T
+                else:
+                    rows, cols = np.nonzero(block >= threshold)
+                    values = block[rows, cols]
+                rows = rows + i0
+                cols = cols + j0
+                upper = rows < cols
+                rows_parts.append(rows[upper])
+                cols_parts.append(cols[upper])
+                values_parts.append(values[upper])
+        
+        rows = np.concatenate(rows_parts)
+        cols = np.concatenate(cols_parts)
+        values = np.concatenate(values_parts)
+        
+        return rows, cols, values
+    
+    @staticmethod
+    def calculate_cosine_similarity(
+        vec1: np.ndarray, 
+        vec2: np.ndarray, 
+        normalized: bool = True
+    ) -> float:
         """
         Calculate cosine similarity between two vectors.
         
         Args:
             vec1: First vector
             vec2: Second vector
+            normalized: Whether the vectors are already unit length
             
         Returns:
             Cosine similarity score between 0 and 1
         """
-        # Using scipy's cosine distance: cosine_similarity = 1 - cosine_distance
-        return 1.0 - cosine(vec1, vec2)
+        if not normalized:
+            vec1 = vec1 / max(np.linalg.norm(vec1), 1e-12)
+            vec2 = vec2 / max(np.linalg.norm(vec2), 1e-12)
+        
+        if simsimd is not None:
+            vec1 = np.asarray(vec1, dtype=np.float32)
+            vec2 = np.asarray(vec2, dtype=np.float32)
+            return 1.0 - float(simsimd.cosine(vec1, vec2))
+        
+        # Since embeddings are normalized, dot product = cosine similarity
+        return float(np.dot(vec1, vec2))
     
     @staticmethod
     def find_similar_pairs(
@@ -78,24 +381,54 @@ class SimilarityService:
         Returns:
             List of tuples (index1, index2, similarity_score) for similar pairs
         """
-        if not 0.0 <= threshold <= 1.0:
-            raise ValueError("Threshold must be between 0.0 and 1.0")
+        return SimilarityService.find_similar_pairs_multi(
+            similarity_matrix, [threshold]
+        )[0]
+    
+    @staticmethod
+    def find_similar_pairs_multi(
+        similarity_matrix: np.ndarray, 
+        thresholds: List[float]
+    ) -> List[List[Tuple[int, int, float]]]:
+        """
+        Find similar pairs for several thresholds in a single pass.
+        
+        Args:
+            similarity_matrix: NxN similarity matrix
+            thresholds: Similarity thresholds (0.0 to 1.0)
+            
+        Returns:
+            One list of (index1, index2, similarity_score) tuples per threshold
+        """
+        for threshold in thresholds:
+            if not 0.0 <= threshold <= 1.0:
+                raise ValueError("Threshold must be between 0.0 and 1.0")
         
-        similar_pairs = []
         n_texts = similarity_matrix.shape[0]
         
         # Only check upper triangle to avoid duplicates
-        for i in range(n_texts):
-            for j in range(i + 1, n_texts):
-                similarity = similarity_matrix[i, j]
-                if similarity >= threshold:
-                    similar_pairs.append((i, j, similarity))
+        rows, cols = np.triu_indices(n_texts, k=1)
+        values = similarity_matrix[rows, cols]
+        mask = values >= min(thresholds)
+        rows, cols, values = rows[mask], cols[mask], values[mask]
         
         # Sort by similarity score (descending)
-        similar_pairs.sort(key=lambda x: x[2], reverse=True)
+        order = np.argsort(-values, kind="stable")
+        rows, cols, values = rows[order], cols[order], values[order]
         
-        logger.info(f"Found {len(similar_pairs)} similar pairs above threshold {threshold}")
-        return similar_pairs
+        # Pairs above each threshold form a prefix of the sorted candidates
+        results = []
+        for threshold in thresholds:
+            count = int(np.count_nonzero(values >= threshold))
+            similar_pairs = list(zip(
+                rows[:count].tolist(),
+                cols[:count].tolist(),
+                values[:count].tolist()
+            ))
+            logger.info(f"Found {len(similar_pairs)} similar pairs above threshold {threshold}")
+            results.append(similar_pairs)
+        
+        return results
     
     @staticmethod
     def get_similarity_statistics(similarity_matrix: np.ndarray) -> dict:
@@ -111,12 +444,12 @@ class SimilarityService:
         n_texts = similarity_matrix.shape[0]
         
         # Get upper triangle (excluding diagonal)
-        upper_triangle = []
-        for i in range(n_texts):
-            for j in range(i + 1, n_texts):
-                upper_triangle.append(similarity_matrix[i, j])
+        upper_triangle = np.asarray(
+            similarity_matrix[np.triu_indices(n_texts, k=1)],
+            dtype=np.float32
+        )
         
-        if not upper_triangle:
+        if upper_triangle.size == 0:
             return {
                 "total_pairs": 0,
                 "mean_similarity": 0.0,
@@ -125,14 +458,12 @@ class SimilarityService:
                 "std_similarity": 0.0
             }
         
-        upper_triangle = np.array(upper_triangle)
-        
         return {
-            "total_pairs": len(upper_triangle),
-            "mean_similarity": float(np.mean(upper_triangle)),
-            "max_similarity": float(np.max(upper_triangle)),
-            "min_similarity": float(np.min(upper_triangle)),
-            "std_similarity": float(np.std(upper_triangle))
+            "total_pairs": int(upper_triangle.size),
+            "mean_similarity": float(upper_triangle.mean()),
+            "max_similarity": float(upper_triangle.max()),
+            "min_similarity": float(upper_triangle.min()),
+            "std_similarity": float(upper_triangle.std())
         }
 
 # Create global instance
@@ -2,251 +2,575 @@
 Text preprocessing utilities for normalizing text before analysis.
 """
 
+import os
 import re
 import string
-from typing import List, Optional
+import threading
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from functools import lru_cache
+from itertools import chain, islice
+from typing import Deque, Dict, Iterable, Iterator, List, Optional, Sized
+import numpy as np
 
-class TextPreprocessor:
-    """Text preprocessing utilities."""
+try:
+    # Optional compiled fast path for ASCII text (cythonize -i app/utils/preprocessing_ext.pyx)
+    from app.utils.preprocessing_ext import preprocess_bytes as _preprocess_bytes
+except ImportError:
+    _preprocess_bytes = None
+
+try:
+    # Optional JIT for the whitespace collapse/lowercase pass
+    from numba import njit
+except ImportError:
+    njit = None
+
+# A single negated class cannot backtrack into alternations (linear-time matching)
+_URL_PATTERN = r'https?://[^\s<>"\'()]+'
+
+# Emails: the local part may only start at the beginning of a run of local-part
+# characters, and the domain is dot-separated labels (no dots inside a label), so
+# the engine cannot re-split the same characters between local part and domain
+_EMAIL_LOCAL = r'[A-Za-z0-9._%+-]+'
+_EMAIL_DOMAIN = r'(?:[A-Za-z0-9](?:[A-Za-z0-9-]{0,61}[A-Za-z0-9])?\.)+[A-Za-z]{2,}'
+_EMAIL_PATTERN = (
+    r'(?<![A-Za-z0-9._%+-])' + _EMAIL_LOCAL + '@' + _EMAIL_DOMAIN + r'(?![A-Za-z0-9-])'
+)
+
+# Precompiled patterns, so calls skip the re module's pattern cache lookup;
+# email uses the same pattern as the fused pass in preprocess_for_similarity.
+# No re.ASCII flag: \s must keep matching Unicode whitespace, and sre classifies
+# ASCII characters through a lookup table either way (no measurable gain)
+_WS_RE = re.compile(r'\s+')
+_URL_RE = re.compile(_URL_PATTERN)
+_EMAIL_RE = re.compile(_EMAIL_PATTERN)
+_NONALNUM_SPACE_RE = re.compile(r'[^a-zA-Z0-9\s]')
+_NONALNUM_RE = re.compile(r'[^a-zA-Z0-9]')
+# Matches one non-blank sentence body, so counting needs no split list
+_SENT_BODY_RE = re.compile(r'[^.!?\s][^.!?]*')
+
+# Translation table deleting ASCII punctuation, built once
+_PUNCT_TABLE = str.maketrans('', '', string.punctuation)
+
+# Preprocessed outputs are memoized for up to this many texts no longer than the
+# character limit (larger texts are not retained)
+_CACHE_SIZE = 4096
+_CACHE_MAX_CHARS = 64 * 1024
+
+# Batches smaller than this are preprocessed serially (pool startup would dominate)
+_PARALLEL_MIN_TEXTS = 32
+
+# Texts per pool task when the input's length is unknown
+_POOL_CHUNKSIZE = 64
+
+# Process pools reused across parallel calls, one per worker count (see _get_process_pool)
+_process_pools: Dict[int, ProcessPoolExecutor] = {}
+_process_pool_lock = threading.Lock()
+
+if njit is not None:
+    @njit(cache=True)
+    def _collapse_ws_lower_kernel(buf, out, lower):
+        """Collapse ASCII whitespace runs to one space, strip and optionally lowercase."""
+        j = 0
+        prev_ws = True
+        for i in range(buf.shape[0]):
+            c = buf[i]
+            if c == 32 or (9 <= c and c <= 13) or (28 <= c and c <= 31):
+                if not prev_ws:
+                    out[j] = 32
+                    j += 1
+                    prev_ws = True
+            else:
+                if lower and 65 <= c and c <= 90:
+                    c += 32
+                out[j] = c
+                j += 1
+                prev_ws = False
+        if j > 0 and out[j - 1] == 32:
+            j -= 1
+        return j
+
+def _collapse_ws_ascii(text: str, lower: bool) -> Optional[str]:
+    """
+    Collapse whitespace (and lowercase) ASCII text with the Numba kernel.
     
-    @staticmethod
-    def clean_text(text: str) -> str:
-        """
-        Basic text cleaning.
-        
-        Args:
-            text: Input text string
-            
-        Returns:
-            Cleaned text string
-        """
-        if not text:
-            return ""
-        
-        # Remove extra whitespace
-        text = re.sub(r'\s+', ' ', text)
-        
-        # Strip leading/trailing whitespace
-        text = text.strip()
-        
-        return text
+    Args:
+        text: Input text string
+        lower: Whether to lowercase the text
+        
+    Returns:
+        Processed text, or None when Numba is missing or the text is not ASCII
+    """
+    if njit is None or not text.isascii():
+        return None
     
-    @staticmethod
-    def normalize_text(text: str, remove_punctuation: bool = False) -> str:
-        """
-        Normalize text by converting to lowercase and optionally removing punctuation.
-        
-        Args:
-            text: Input text string
-            remove_punctuation: Whether to remove punctuation
-            
-        Returns:
-            Normalized text string
-        """
-        if not text:
-            return ""
-        
-        # Convert to lowercase
+    buf = np.frombuffer(text.encode('ascii'), dtype=np.uint8)
+    out = np.empty_like(buf)
+    n = _collapse_ws_lower_kernel(buf, out, lower)
+    return out[:n].tobytes().decode('ascii')
+
+@lru_cache(maxsize=None)
+def _combined_pattern(
+    remove_emails: bool,
+    remove_punctuation: bool
+) -> re.Pattern:
+    """
+    Build one pattern matching runs of whitespace and removable spans.
+    
+    Args:
+        remove_emails: Whether email addresses are part of the removable spans
+        remove_punctuation: Whether punctuation is part of the removable spans
+        
+    Returns:
+        Compiled pattern matching maximal runs of whitespace/removable spans
+    """
+    alternatives = [r'\s']
+    if remove_emails:
+        alternatives.append(_EMAIL_PATTERN)
+    if remove_punctuation:
+        alternatives.append('[' + re.escape(string.punctuation) + ']')
+    return re.compile('(?:' + '|'.join(alternatives) + ')+')
+
+def _replace_run(match: re.Match) -> str:
+    """Collapse a removed run to one space if it contained whitespace, else drop it."""
+    return ' ' if _WS_RE.search(match.group()) else ''
+
+def clean_text(text: str) -> str:
+    """
+    Basic text cleaning.
+    
+    Args:
+        text: Input text string
+        
+    Returns:
+        Cleaned text string
+    """
+    if not text:
+        return ""
+    
+    # Remove extra whitespace; ' ' is the only printable whitespace character,
+    # so printable text without double spaces has nothing to collapse
+    if '  ' in text or not text.isprintable():
+        collapsed = _collapse_ws_ascii(text, lower=False)
+        if collapsed is not None:
+            return collapsed
+        text = _WS_RE.sub(' ', text)
+    
+    # Strip leading/trailing whitespace
+    text = text.strip()
+    
+    return text
+
+def normalize_text(text: str, remove_punctuation: bool = False) -> str:
+    """
+    Normalize text by converting to lowercase and optionally removing punctuation.
+    
+    Args:
+        text: Input text string
+        remove_punctuation: Whether to remove punctuation
+        
+    Returns:
+        Normalized text string
+    """
+    if not text:
+        return ""
+    
+    # Unicode lowercasing is context-sensitive (final sigma depends on the next
+    # character), so non-ASCII text is lowercased before punctuation is deleted
+    if not text.isascii():
         text = text.lower()
-        
-        # Remove punctuation if requested
         if remove_punctuation:
-            text = text.translate(str.maketrans('', '', string.punctuation))
-        
-        # Clean whitespace
-        text = TextPreprocessor.clean_text(text)
-        
-        return text
+            text = text.translate(_PUNCT_TABLE)
+        return clean_text(text)
     
-    @staticmethod
-    def remove_urls(text: str) -> str:
-        """
-        Remove URLs from text.
-        
-        Args:
-            text: Input text string
-            
-        Returns:
-            Text with URLs removed
-        """
-        if not text:
-            return ""
-        
-        # Remove URLs
-        url_pattern = r'http[s]?://(?:[a-zA-Z]|[0-9]|[$-_@.&+]|[!*\\(\\),]|(?:%[0-9a-fA-F][0-9a-fA-F]))+'
-        text = re.sub(url_pattern, '', text)
-        
-        # Clean whitespace
-        text = TextPreprocessor.clean_text(text)
-        
-        return text
+    # Remove punctuation if requested (ASCII lowercasing is context-free)
+    if remove_punctuation:
+        text = text.translate(_PUNCT_TABLE)
     
-    @staticmethod
-    def remove_emails(text: str) -> str:
-        """
-        Remove email addresses from text.
-        
-        Args:
-            text: Input text string
-            
-        Returns:
-            Text with email addresses removed
-        """
-        if not text:
-            return ""
-        
-        # Remove email addresses
-        email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-        text = re.sub(email_pattern, '', text)
-        
-        # Clean whitespace
-        text = TextPreprocessor.clean_text(text)
-        
+    # ASCII text is lowercased and cleaned in a single JIT-compiled pass
+    normalized = _collapse_ws_ascii(text, lower=True)
+    if normalized is not None:
+        return normalized
+    
+    # Convert to lowercase (str.lower already has a one-byte fast path for ASCII
+    # strings; a bytes.translate round trip through an encoding is slower)
+    text = text.lower()
+    
+    # Clean whitespace
+    text = clean_text(text)
+    
+    return text
+
+def remove_urls(text: str) -> str:
+    """
+    Remove URLs from text.
+    
+    Args:
+        text: Input text string
+        
+    Returns:
+        Text with URLs removed
+    """
+    if not text:
+        return ""
+    
+    return clean_text(_remove_urls_raw(text))
+
+def _remove_urls_raw(text: str) -> str:
+    """Remove URLs without cleaning whitespace afterwards."""
+    # Cheap substring check before invoking the regex engine
+    if '://' in text:
+        text = _URL_RE.sub('', text)
+    return text
+
+def remove_emails(text: str) -> str:
+    """
+    Remove email addresses from text.
+    
+    Args:
+        text: Input text string
+        
+    Returns:
+        Text with email addresses removed
+    """
+    if not text:
+        return ""
+    
+    return clean_text(_remove_emails_raw(text))
+
+def _remove_emails_raw(text: str) -> str:
+    """Remove email addresses without cleaning whitespace afterwards."""
+    # Cheap substring check before invoking the regex engine
+    if '@' in text:
+        text = _EMAIL_RE.sub('', text)
+    return text
+
+def remove_special_characters(text: str, keep_spaces: bool = True) -> str:
+    """
+    Remove special characters from text.
+    
+    Args:
+        text: Input text string
+        keep_spaces: Whether to keep spaces
+        
+    Returns:
+        Text with special characters removed
+    """
+    if not text:
+        return ""
+    
+    text = _remove_special_raw(text, keep_spaces)
+    
+    # Without spaces there is no whitespace left to clean
+    if not keep_spaces:
         return text
     
-    @staticmethod
-    def remove_special_characters(text: str, keep_spaces: bool = True) -> str:
-        """
-        Remove special characters from text.
-        
-        Args:
-            text: Input text string
-            keep_spaces: Whether to keep spaces
-            
-        Returns:
-            Text with special characters removed
-        """
-        if not text:
-            return ""
-        
-        if keep_spaces:
-            # Keep only alphanumeric characters and spaces
-            text = re.sub(r'[^a-zA-Z0-9\s]', '', text)
+    return clean_text(text)
+
+def _remove_special_raw(text: str, keep_spaces: bool = True) -> str:
+    """Remove special characters without cleaning whitespace afterwards."""
+    if keep_spaces:
+        # Keep only alphanumeric characters and spaces
+        return _NONALNUM_SPACE_RE.sub('', text)
+    
+    # Keep only alphanumeric characters
+    return _NONALNUM_RE.sub('', text)
+
+def preprocess_for_similarity(
+    text: str,
+    remove_urls: bool = True,
+    remove_emails: bool = True,
+    normalize: bool = True,
+    remove_punctuation: bool = False
+) -> str:
+    """
+    Comprehensive preprocessing for similarity analysis.
+    
+    Args:
+        text: Input text string
+        remove_urls: Whether to remove URLs
+        remove_emails: Whether to remove email addresses
+        normalize: Whether to normalize (lowercase)
+        remove_punctuation: Whether to remove punctuation
+        
+    Returns:
+        Preprocessed text string
+    """
+    if not text:
+        return ""
+    
+    # Texts up to the size limit are memoized, so documents repeated across
+    # batches (e.g. a shared reference corpus) skip the pipeline
+    if len(text) <= _CACHE_MAX_CHARS:
+        flags = (
+            bool(remove_urls)
+            | bool(remove_emails) << 1
+            | bool(normalize) << 2
+            | bool(remove_punctuation) << 3
+        )
+        return _preprocess_cached(text, flags)
+    
+    return _preprocess(
+        text, remove_urls, remove_emails, normalize, remove_punctuation
+    )
+
+def _preprocess(
+    text: str,
+    remove_urls: bool,
+    remove_emails: bool,
+    normalize: bool,
+    remove_punctuation: bool
+) -> str:
+    """
+    Run the preprocessing pipeline on non-empty text (uncached).
+    
+    Args:
+        text: Input text string
+        remove_urls: Whether to remove URLs
+        remove_emails: Whether to remove email addresses
+        normalize: Whether to normalize (lowercase)
+        remove_punctuation: Whether to remove punctuation
+        
+    Returns:
+        Preprocessed text string
+    """
+    # ASCII text takes the compiled single-pass path when the extension is built
+    if _preprocess_bytes is not None and text.isascii():
+        return _preprocess_bytes(
+            text.encode('ascii'),
+            remove_urls,
+            remove_emails,
+            normalize,
+            normalize and remove_punctuation
+        ).decode('ascii')
+    
+    # URLs go first: an email glued to a URL must not swallow part of it
+    if remove_urls:
+        text = _remove_urls_raw(text)
+    
+    # Unicode lowercasing is context-sensitive (final sigma depends on the next
+    # character), so non-ASCII text keeps its punctuation until after lowercasing
+    remove_punctuation = normalize and remove_punctuation
+    punctuation_late = remove_punctuation and not text.isascii()
+    
+    # One scan removes emails and punctuation and collapses whitespace runs
+    # (substring check skips the email branch when no match is possible)
+    pattern = _combined_pattern(
+        remove_emails and '@' in text,
+        remove_punctuation and not punctuation_late
+    )
+    processed_text = pattern.sub(_replace_run, text).strip()
+    
+    # Normalize if requested
+    if normalize:
+        processed_text = processed_text.lower()
+    
+    if punctuation_late:
+        processed_text = clean_text(processed_text.translate(_PUNCT_TABLE))
+    
+    return processed_text
+
+def preprocess_texts(
+    texts: List[str],
+    remove_urls: bool = True,
+    remove_emails: bool = True,
+    normalize: bool = True,
+    remove_punctuation: bool = False,
+    n_jobs: Optional[int] = 1,
+    chunksize: Optional[int] = None
+) -> List[str]:
+    """
+    Preprocess a list of texts.
+    
+    Args:
+        texts: List of input text strings
+        remove_urls: Whether to remove URLs
+        remove_emails: Whether to remove email addresses
+        normalize: Whether to normalize (lowercase)
+        remove_punctuation: Whether to remove punctuation
+        n_jobs: Worker processes for large batches (1: serial, None: CPU count);
+            pool workers do not share this process's memoized outputs
+        chunksize: Texts per task sent to a worker (None: about 4 chunks per worker)
+        
+    Returns:
+        List of preprocessed text strings
+    """
+    return list(iter_preprocessed(
+        texts,
+        remove_urls=remove_urls,
+        remove_emails=remove_emails,
+        normalize=normalize,
+        remove_punctuation=remove_punctuation,
+        n_jobs=n_jobs,
+        chunksize=chunksize
+    ))
+
+def iter_preprocessed(
+    texts: Iterable[str],
+    remove_urls: bool = True,
+    remove_emails: bool = True,
+    normalize: bool = True,
+    remove_punctuation: bool = False,
+    n_jobs: Optional[int] = 1,
+    chunksize: Optional[int] = None
+) -> Iterator[str]:
+    """
+    Preprocess texts lazily, yielding results in input order.
+    
+    The input is consumed incrementally. With a process pool at most two chunks
+    per worker are in flight, so memory is bounded by that window rather than by
+    the corpus, and closing the generator early cancels chunks not yet started.
+    
+    Args:
+        texts: Iterable of input text strings
+        remove_urls: Whether to remove URLs
+        remove_emails: Whether to remove email addresses
+        normalize: Whether to normalize (lowercase)
+        remove_punctuation: Whether to remove punctuation
+        n_jobs: Worker processes for large inputs (1: serial, None: CPU count);
+            pool workers do not share this process's memoized outputs
+        chunksize: Texts per task sent to a worker (None: about 4 chunks per
+            worker for sized inputs, else a fixed size)
+        
+    Yields:
+        Preprocessed text strings
+    """
+    options = (remove_urls, remove_emails, normalize, remove_punctuation)
+    iterator = iter(texts)
+    
+    # Inputs shorter than the threshold are preprocessed serially (pool overhead
+    # would dominate); peek ahead instead of requiring len()
+    n_jobs = n_jobs or os.cpu_count() or 1
+    head = list(islice(iterator, _PARALLEL_MIN_TEXTS)) if n_jobs > 1 else []
+    if n_jobs == 1 or len(head) < _PARALLEL_MIN_TEXTS:
+        for text in chain(head, iterator):
+            yield preprocess_for_similarity(text, *options)
+        return
+    
+    if chunksize is None:
+        if isinstance(texts, Sized):
+            chunksize = max(1, len(texts) // (n_jobs * 4))
         else:
-            # Keep only alphanumeric characters
-            text = re.sub(r'[^a-zA-Z0-9]', '', text)
-        
-        # Clean whitespace
-        text = TextPreprocessor.clean_text(text)
-        
-        return text
+            chunksize = _POOL_CHUNKSIZE
     
-    @staticmethod
-    def preprocess_for_similarity(
-        text: str,
-        remove_urls: bool = True,
-        remove_emails: bool = True,
-        normalize: bool = True,
-        remove_punctuation: bool = False
-    ) -> str:
-        """
-        Comprehensive preprocessing for similarity analysis.
-        
-        Args:
-            text: Input text string
-            remove_urls: Whether to remove URLs
-            remove_emails: Whether to remove email addresses
-            normalize: Whether to normalize (lowercase)
-            remove_punctuation: Whether to remove punctuation
-            
-        Returns:
-            Preprocessed text string
-        """
-        if not text:
-            return ""
-        
-        # Start with basic cleaning
-        processed_text = TextPreprocessor.clean_text(text)
-        
-        # Remove URLs if requested
-        if remove_urls:
-            processed_text = TextPreprocessor.remove_urls(processed_text)
-        
-        # Remove emails if requested
-        if remove_emails:
-            processed_text = TextPreprocessor.remove_emails(processed_text)
-        
-        # Normalize if requested
-        if normalize:
-            processed_text = TextPreprocessor.normalize_text(
-                processed_text, 
-                remove_punctuation=remove_punctuation
-            )
-        
-        return processed_text
-    
-    @staticmethod
-    def preprocess_texts(
-        texts: List[str],
-        remove_urls: bool = True,
-        remove_emails: bool = True,
-        normalize: bool = True,
-        remove_punctuation: bool = False
-    ) -> List[str]:
-        """
-        Preprocess a list of texts.
-        
-        Args:
-            texts: List of input text strings
-            remove_urls: Whether to remove URLs
-            remove_emails: Whether to remove email addresses
-            normalize: Whether to normalize (lowercase)
-            remove_punctuation: Whether to remove punctuation
-            
-        Returns:
-            List of preprocessed text strings
-        """
-        return [
-            TextPreprocessor.preprocess_for_similarity(
-                text,
-                remove_urls=remove_urls,
-                remove_emails=remove_emails,
-                normalize=normalize,
-                remove_punctuation=remove_punctuation
-            )
-            for text in texts
-        ]
-    
-    @staticmethod
-    def get_text_stats(text: str) -> dict:
-        """
-        Get statistics about a text.
-        
-        Args:
-            text: Input text string
-            
-        Returns:
-            Dictionary with text statistics
-        """
-        if not text:
-            return {
-                "char_count": 0,
-                "word_count": 0,
-                "sentence_count": 0,
-                "paragraph_count": 0
-            }
-        
-        # Character count
-        char_count = len(text)
-        
-        # Word count
-        words = text.split()
-        word_count = len(words)
-        
-        # Sentence count (approximate)
-        sentences = re.split(r'[.!?]+', text)
-        sentence_count = len([s for s in sentences if s.strip()])
-        
-        # Paragraph count (approximate)
-        paragraphs = text.split('\n\n')
-        paragraph_count = len([p for p in paragraphs if p.strip()])
+    # Regex-heavy work is CPU-bound under the GIL, so fan out to processes,
+    # keeping a bounded window of chunks submitted ahead of the consumer
+    executor = _get_process_pool(n_jobs)
+    remaining = chain(head, iterator)
+    pending: Deque[Future] = deque()
+    try:
+        while True:
+            chunk = list(islice(remaining, chunksize))
+            if chunk:
+                pending.append(executor.submit(_preprocess_chunk_worker, chunk, *options))
+            if pending and (not chunk or len(pending) >= n_jobs * 2):
+                yield from pending.popleft().result()
+            elif not chunk:
+                return
+    finally:
+        for future in pending:
+            future.cancel()
+
+def get_text_stats(text: str) -> dict:
+    """
+    Get statistics about a text.
+    
+    Args:
+        text: Input text string
         
+    Returns:
+        Dictionary with text statistics
+    """
+    if not text:
         return {
-            "char_count": char_count,
-            "word_count": word_count,
-            "sentence_count": sentence_count,
-            "paragraph_count": paragraph_count
+            "char_count": 0,
+            "word_count": 0,
+            "sentence_count": 0,
+            "paragraph_count": 0
         }
+    
+    # Character count
+    char_count = len(text)
+    
+    # Word count
+    word_count = len(text.split())
+    
+    # Sentence count (approximate): one match per non-blank run between terminators
+    sentence_count = sum(1 for _ in _SENT_BODY_RE.finditer(text))
+    
+    # Paragraph count (approximate)
+    paragraph_count = sum(
+        1 for p in text.split('\n\n') if p and not p.isspace()
+    )
+    
+    return {
+        "char_count": char_count,
+        "word_count": word_count,
+        "sentence_count": sentence_count,
+        "paragraph_count": paragraph_count
+    }
+
+def _get_process_pool(n_jobs: int) -> ProcessPoolExecutor:
+    """
+    Return the process pool shared across calls, creating it on first use.
+    
+    Pools are kept per worker count and never shut down here, so a generator
+    still draining one pool is unaffected by calls with a different n_jobs.
+    
+    Args:
+        n_jobs: Number of worker processes
+        
+    Returns:
+        Pool with n_jobs workers
+    """
+    with _process_pool_lock:
+        pool = _process_pools.get(n_jobs)
+        if pool is None:
+            pool = _process_pools[n_jobs] = ProcessPoolExecutor(max_workers=n_jobs)
+        return pool
+
+@lru_cache(maxsize=_CACHE_SIZE)
+def _preprocess_cached(text: str, flags: int) -> str:
+    """Memoized preprocessing pipeline keyed by text and packed option flags."""
+    return _preprocess(
+        text,
+        remove_urls=bool(flags & 1),
+        remove_emails=bool(flags & 2),
+        normalize=bool(flags & 4),
+        remove_punctuation=bool(flags & 8)
+    )
+
+def _preprocess_chunk_worker(
+    texts: List[str],
+    remove_urls: bool,
+    remove_emails: bool,
+    normalize: bool,
+    remove_punctuation: bool
+) -> List[str]:
+    """Module-level (picklable) entry point for process pool workers."""
+    return [
+        preprocess_for_similarity(
+            text,
+            remove_urls=remove_urls,
+            remove_emails=remove_emails,
+            normalize=normalize,
+            remove_punctuation=remove_punctuation
+        )
+        for text in texts
+    ]
+
+class TextPreprocessor:
+    """Namespace over the module-level functions, kept for backward compatibility."""
+    
+    clean_text = staticmethod(clean_text)
+    normalize_text = staticmethod(normalize_text)
+    remove_urls = staticmethod(remove_urls)
+    remove_emails = staticmethod(remove_emails)
+    remove_special_characters = staticmethod(remove_special_characters)
+    preprocess_for_similarity = staticmethod(preprocess_for_similarity)
+    preprocess_texts = staticmethod(preprocess_texts)
+    iter_preprocessed = staticmethod(iter_preprocessed)
+    get_text_stats = staticmethod(get_text_stats)
 
 # Create global instance
 text_preprocessor = TextPreprocessor() 
\ No newline at end of file
@@ -0,0 +1,193 @@
+# cython: language_level=3, boundscheck=False, wraparound=False, cdivision=True
+"""
+Compiled single-pass preprocessing for ASCII text.
+
+Mirrors app.utils.preprocessing.preprocess_for_similarity byte for byte on ASCII input.
+Build in place with: cythonize -i app/utils/preprocessing_ext.pyx
+"""
+
+from cpython.bytes cimport PyBytes_AS_STRING, PyBytes_FromStringAndSize, PyBytes_GET_SIZE
+from libc.stdlib cimport free, malloc
+from libc.string cimport memchr, memcmp
+
+cdef inline bint _is_space(unsigned char c) noexcept nogil:
+    """Whitespace as matched by re's \\s (and str.strip) on ASCII."""
+    return c == 32 or 9 <= c <= 13 or 28 <= c <= 31
+
+cdef inline bint _is_alpha(unsigned char c) noexcept nogil:
+    return 65 <= c <= 90 or 97 <= c <= 122
+
+cdef inline bint _is_alnum(unsigned char c) noexcept nogil:
+    return _is_alpha(c) or 48 <= c <= 57
+
+cdef inline bint _is_label(unsigned char c) noexcept nogil:
+    """Domain label characters: [A-Za-z0-9-]."""
+    return _is_alnum(c) or c == 45
+
+cdef inline bint _is_local(unsigned char c) noexcept nogil:
+    """Email local-part characters: [A-Za-z0-9._%+-]."""
+    return _is_label(c) or c == 46 or c == 95 or c == 37 or c == 43
+
+cdef inline bint _is_punct(unsigned char c) noexcept nogil:
+    """Characters in string.punctuation."""
+    return 33 <= c <= 47 or 58 <= c <= 64 or 91 <= c <= 96 or 123 <= c <= 126
+
+cdef inline bint _is_url_stop(unsigned char c) noexcept nogil:
+    """Characters that end a URL: whitespace and <>"'()."""
+    return _is_space(c) or c == 60 or c == 62 or c == 34 or c == 39 or c == 40 or c == 41
+
+cdef Py_ssize_t _email_end(const unsigned char* buf, Py_ssize_t n, Py_ssize_t i) noexcept nogil:
+    """Return the end of the email starting at i, or -1 if none starts there."""
+    cdef Py_ssize_t k, start, best = -1, labels = 0
+    cdef bint letters
+
+    # The local part must start a run of local-part characters
+    if not _is_local(buf[i]) or (i > 0 and _is_local(buf[i - 1])):
+        return -1
+    k = i
+    while k < n and _is_local(buf[k]):
+        k += 1
+    if k >= n or buf[k] != 64:
+        return -1
+
+    # Walk dot-separated segments; the email ends after the last segment that is
+    # a valid TLD preceded only by valid labels (the regex's greedy choice)
+    k += 1
+    while True:
+        start = k
+        letters = True
+        while k < n and _is_label(buf[k]):
+            if not _is_alpha(buf[k]):
+                letters = False
+            k += 1
+        if labels > 0 and letters and k - start >= 2:
+            best = k
+        if (
+            0 < k - start <= 63
+            and _is_alnum(buf[start])
+            and _is_alnum(buf[k - 1])
+            and k < n
+            and buf[k] == 46
+        ):
+            labels += 1
+            k += 1
+        else:
+            return best
+
+cdef Py_ssize_t _strip_urls(const unsigned char* src, Py_ssize_t n, unsigned char* dst) noexcept nogil:
+    """Copy src to dst without http(s):// URLs; return the output length."""
+    cdef Py_ssize_t i = 0, j = 0, k
+
+    while i < n:
+        if src[i] == 104 and n - i >= 4 and memcmp(src + i, b"http", 4) == 0:
+            k = i + 4
+            if k < n and src[k] == 115:
+                k += 1
+            if n - k >= 4 and memcmp(src + k, b"://", 3) == 0 and not _is_url_stop(src[k + 3]):
+                k += 3
+                while k < n and not _is_url_stop(src[k]):
+                    k += 1
+                i = k
+                continue
+        dst[j] = src[i]
+        j += 1
+        i += 1
+    return j
+
+cdef Py_ssize_t _collapse_runs(
+    const unsigned char* src,
+    Py_ssize_t n,
+    unsigned char* dst,
+    bint remove_emails,
+    bint lower,
+    bint remove_punct
+) noexcept nogil:
+    """
+    Replace runs of whitespace/emails/punctuation with one space (or nothing when
+    the run has no whitespace), lowercasing the kept bytes; return the output length.
+
+    dst may be src: the write position never passes the read position, and a byte
+    rewritten in place keeps its class for the email lookbehind check.
+    """
+    cdef Py_ssize_t i = 0, j = 0, run_start, end
+    cdef unsigned char c
+    cdef bint saw_space
+
+    while i < n:
+        run_start = i
+        saw_space = False
+        while i < n:
+            c = src[i]
+            if _is_space(c):
+                saw_space = True
+                i += 1
+                continue
+            if remove_emails:
+                end = _email_end(src, n, i)
+                if end > 0:
+                    i = end
+                    continue
+            if remove_punct and _is_punct(c):
+                i += 1
+                continue
+            break
+
+        if i > run_start:
+            if saw_space:
+                dst[j] = 32
+                j += 1
+        else:
+            c = src[i]
+            if lower and 65 <= c <= 90:
+                c += 32
+            dst[j] = c
+            j += 1
+            i += 1
+    return j
+
+cpdef bytes preprocess_bytes(
+    bytes data,
+    bint remove_urls,
+    bint remove_emails,
+    bint lower,
+    bint remove_punct
+):
+    """
+    Preprocess ASCII-encoded text in one linear pass per stage.
+
+    Args:
+        data: ASCII-encoded input text
+        remove_urls: Whether to remove http(s) URLs
+        remove_emails: Whether to remove email addresses
+        lower: Whether to lowercase the output
+        remove_punct: Whether to remove punctuation
+
+    Returns:
+        Preprocessed ASCII bytes
+    """
+    cdef Py_ssize_t n = PyBytes_GET_SIZE(data)
+    cdef const unsigned char* src = <const unsigned char*> PyBytes_AS_STRING(data)
+    cdef unsigned char* buf = <unsigned char*> malloc(n + 1)
+    cdef Py_ssize_t start = 0, end
+
+    if buf == NULL:
+        raise MemoryError()
+    try:
+        with nogil:
+            # URLs go first: an email glued to a URL must not swallow part of it.
+            # Both stages share one buffer; the run collapse then works in place
+            if remove_urls and memchr(src, 58, n) != NULL:
+                n = _strip_urls(src, n, buf)
+                src = buf
+            remove_emails = remove_emails and memchr(src, 64, n) != NULL
+            end = _collapse_runs(src, n, buf, remove_emails, lower, remove_punct)
+
+            # Runs are already collapsed, so at most one space sits at each end
+            if end > 0 and buf[end - 1] == 32:
+                end -= 1
+            if end > 0 and buf[0] == 32:
+                start = 1
+
+        return PyBytes_FromStringAndSize(<char*> buf + start, end - start)
+    finally:
+        free(buf)
@@ -0,0 +1,90 @@
+"""
+Tests for the async request batcher.
+"""
+
+import asyncio
+import threading
+
+import pytest
+
+from app.services.batching import AsyncBatcher
+
+class _RecordingBatch:
+    """Batch function that records each call and doubles its items."""
+    
+    def __init__(self, fail: bool = False):
+        self.calls = []
+        self.fail = fail
+        self.lock = threading.Lock()
+    
+    def __call__(self, items):
+        with self.lock:
+            self.calls.append(list(items))
+        if self.fail:
+            raise RuntimeError("batch failed")
+        return [item * 2 for item in items]
+
+def test_concurrent_submissions_are_merged_and_sliced():
+    process_batch = _RecordingBatch()
+    batcher = AsyncBatcher(process_batch, max_batch_size=64, max_wait_ms=50)
+    
+    async def run():
+        return await asyncio.gather(
+            batcher.submit([1, 2, 3]),
+            batcher.submit([10]),
+            batcher.submit([20, 30])
+        )
+    
+    results = asyncio.run(run())
+    
+    assert process_batch.calls == [[1, 2, 3, 10, 20, 30]]
+    assert [list(result) for result in results] == [[2, 4, 6], [20], [40, 60]]
+
+def test_full_batch_flushes_before_wait_window():
+    process_batch = _RecordingBatch()
+    batcher = AsyncBatcher(process_batch, max_batch_size=4, max_wait_ms=60_000)
+    
+    async def run():
+        return await asyncio.wait_for(
+            asyncio.gather(batcher.submit([1, 2]), batcher.submit([3, 4])),
+            timeout=5
+        )
+    
+    results = asyncio.run(run())
+    
+    assert process_batch.calls == [[1, 2, 3, 4]]
+    assert [list(result) for result in results] == [[2, 4], [6, 8]]
+
+def test_error_is_raised_for_every_caller():
+    process_batch = _RecordingBatch(fail=True)
+    batcher = AsyncBatcher(process_batch, max_batch_size=64, max_wait_ms=50)
+    
+    async def run():
+        return await asyncio.gather(
+            batcher.submit([1]),
+            batcher.submit([2, 3]),
+            return_exceptions=True
+        )
+    
+    results = asyncio.run(run())
+    
+    assert len(process_batch.calls) == 1
+    assert all(isinstance(result, RuntimeError) for result in results)
+
+def test_worker_survives_a_failed_batch():
+    process_batch = _RecordingBatch(fail=True)
+    batcher = AsyncBatcher(process_batch, max_batch_size=64, max_wait_ms=1)
+    
+    async def run():
+        with pytest.raises(RuntimeError):
+            await batcher.submit([1])
+        process_batch.fail = False
+        return await batcher.submit([2])
+    
+    assert list(asyncio.run(run())) == [4]
+
+def test_empty_submission_is_rejected():
+    batcher = AsyncBatcher(_RecordingBatch())
+    
+    with pytest.raises(ValueError):
+        asyncio.run(batcher.submit([]))
\ No newline at end of file
@@ -0,0 +1,77 @@
+"""
+Equivalence tests for the optional compiled preprocessing extension.
+
+The extension is imported if already built, otherwise built on the fly with
+pyximport; the tests are skipped when neither is possible.
+"""
+
+import itertools
+import random
+
+import pytest
+
+from app.utils import preprocessing
+
+# Every combination of (remove_urls, remove_emails, normalize, remove_punctuation)
+FLAG_COMBINATIONS = list(itertools.product([False, True], repeat=4))
+
+FIXED_TEXTS = [
+    "Hello, World!",
+    "  Leading and trailing whitespace  ",
+    "Tabs\tnew\nlines\rand\x0bvertical\x0cfeeds\x1cfile\x1dgroup\x1erecord\x1funit",
+    "Visit https://example.com/path?q=1&r=2 or http://foo.org.",
+    "Glued:https://example.com/a(b)c and \"http://x.io\" <http://y.io>",
+    "Not a url: http:// nor https:/ nor ftp://example.com",
+    "Contact john.doe+tag@mail.example.co.uk, or x@y.z today.",
+    "Edge emails: a@b.cc a@-b.com a@b-.com a@b..com a.b@c.d1 foo@bar.baz.q1",
+    "email@https://example.com and https://example.com/user@mail.com",
+    "user@example.com@example.org..net",
+    "!!!...???;;;",
+    "---",
+    " ",
+    "x",
+    "MiXeD CaSe With 123 Numbers_and_underscores",
+]
+
+_TOKENS = [
+    "word", "Word", "WORD", "a", "I", "42", "x1", "_", "-", ".", ",", "!", "@",
+    ":", "/", "//", "(", ")", "<", ">", "\"", "'", " ", "  ", "\t", "\n", "\x0b",
+    "\x1c", "http://", "https://", "http:", "example.com", "mail.org", "user",
+    "first.last", "a+b", "%", "co.uk", "..",
+]
+
+def _random_texts(count: int, seed: int = 1234) -> list:
+    """Build seeded ASCII texts from token soup and from raw printable bytes."""
+    rng = random.Random(seed)
+    texts = []
+    for _ in range(count):
+        texts.append("".join(rng.choice(_TOKENS) for _ in range(rng.randint(1, 40))))
+        texts.append("".join(chr(rng.randint(0, 127)) for _ in range(rng.randint(1, 60))))
+    return texts
+
+TEXTS = FIXED_TEXTS + _random_texts(500)
+
+@pytest.fixture(scope="module")
+def preprocess_bytes():
+    """The compiled preprocess_bytes, built with pyximport if needed."""
+    try:
+        from app.utils.preprocessing_ext import preprocess_bytes
+    except ImportError:
+        pyximport = pytest.importorskip("pyximport")
+        pyximport.install(language_level=3)
+        try:
+            from app.utils.preprocessing_ext import preprocess_bytes
+        except ImportError as e:
+            pytest.skip(f"Could not build preprocessing_ext: {e}")
+    return preprocess_bytes
+
+@pytest.mark.parametrize("flags", FLAG_COMBINATIONS)
+def test_extension_matches_regex_pipeline(monkeypatch, preprocess_bytes, flags):
+    monkeypatch.setattr(preprocessing, "_preprocess_bytes", None)
+    expected = [preprocessing._preprocess(text, *flags) for text in TEXTS]
+    
+    monkeypatch.setattr(preprocessing, "_preprocess_bytes", preprocess_bytes)
+    actual = [preprocessing._preprocess(text, *flags) for text in TEXTS]
+    
+    for text, want, got in zip(TEXTS, expected, actual):
+        assert got == want, f"flags={flags} text={text!r}"
\ No newline at end of file
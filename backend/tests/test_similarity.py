@@ -0,0 +1,71 @@
+"""
+Equivalence tests for the streaming similar-pair search.
+
+The Numba and tiled paths of find_similar_pairs_streaming are checked against
+find_similar_pairs on the full matrix; the Numba cases are skipped when Numba
+is not installed.
+"""
+
+import numpy as np
+import pytest
+
+pytest.importorskip("torch")
+
+from app.config import settings
+from app.services import similarity
+from app.services.similarity import SimilarityService
+
+THRESHOLDS = [0.0, 0.3, 0.7, 0.9, 0.99, 1.0]
+
+# Pairs scoring this close to the threshold may land on either side of it,
+# since each path accumulates dot products in a different order
+BORDERLINE = 1e-5
+
+def _embeddings(seed: int = 1234) -> np.ndarray:
+    """Random embeddings with clusters of near-duplicates to populate many rows."""
+    rng = np.random.default_rng(seed)
+    centers = rng.standard_normal((12, 64)).astype(np.float32)
+    members = centers[rng.integers(0, len(centers), 300)]
+    noise = rng.standard_normal(members.shape).astype(np.float32)
+    scale = rng.choice([0.01, 0.1, 0.5, 2.0], size=(len(members), 1)).astype(np.float32)
+    return np.vstack([members + scale * noise, members[:20]])
+
+def _as_dict(pairs):
+    """Map (index1, index2) to the reported score."""
+    return {(i, j): score for i, j, score in pairs}
+
+@pytest.fixture(params=["tiled", "numba"])
+def streaming_path(request, monkeypatch):
+    """Force find_similar_pairs_streaming onto one CPU path."""
+    use_numba = request.param == "numba"
+    if use_numba and similarity.njit is None:
+        pytest.skip("numba is not installed")
+    monkeypatch.setattr(settings, "SIMILARITY_USE_NUMBA", use_numba)
+    monkeypatch.setattr(SimilarityService, "_use_gpu", staticmethod(lambda: False))
+    return request.param
+
+@pytest.mark.parametrize("threshold", THRESHOLDS)
+def test_streaming_matches_full_matrix(streaming_path, threshold):
+    embeddings = _embeddings()
+    matrix = SimilarityService.calculate_similarity_matrix(embeddings)
+    expected = _as_dict(SimilarityService.find_similar_pairs(matrix, threshold))
+    actual_pairs = SimilarityService.find_similar_pairs_streaming(
+        embeddings, threshold, tile_size=64
+    )
+    actual = _as_dict(actual_pairs)
+    
+    assert len(actual) == len(actual_pairs)
+    assert all(i < j for i, j in actual)
+    
+    # Pairs agree except where the score is within rounding of the threshold
+    for i, j in expected.keys() | actual.keys():
+        score = matrix[i, j]
+        if abs(score - threshold) < BORDERLINE:
+            continue
+        assert (i, j) in expected, f"extra pair ({i}, {j}) scoring {score}"
+        assert (i, j) in actual, f"missing pair ({i}, {j}) scoring {score}"
+        assert actual[i, j] == pytest.approx(expected[i, j], abs=BORDERLINE)
+    
+    # Same ordering contract: descending score
+    values = [score for _, _, score in actual_pairs]
+    assert values == sorted(values, reverse=True)
\ No newline at end of file
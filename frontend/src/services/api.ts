@@ -2,6 +2,7 @@ import axios from "axios";
 import type {
   AnalyzeRequest,
   AnalyzeResponse,
+  AnalyzeCompactResponse,
   ModelsResponse,
   HealthResponse,
 } from "../types/api";
@@ -52,11 +53,31 @@ apiClient.interceptors.response.use(
   }
 );
 
+// Rebuild the full symmetric matrix from its row-major upper triangle
+export const expandUpper = (upper: number[], n: number): number[][] => {
+  const matrix = Array.from({ length: n }, () => new Array<number>(n).fill(1));
+  let k = 0;
+  for (let i = 0; i < n; i++) {
+    for (let j = i + 1; j < n; j++) {
+      matrix[i][j] = upper[k];
+      matrix[j][i] = upper[k];
+      k++;
+    }
+  }
+  return matrix;
+};
+
 export const apiService = {
   // Analyze texts for plagiarism
   async analyzePlagiarism(request: AnalyzeRequest): Promise<AnalyzeResponse> {
-    const response = await apiClient.post<AnalyzeResponse>("/analyze", request);
-    return response.data;
+    // Request the compact form (half the matrix payload) and expand it locally
+    const response = await apiClient.post<AnalyzeCompactResponse>(
+      "/analyze",
+      request,
+      { params: { compact: true } }
+    );
+    const { similarity_upper, n_texts, ...rest } = response.data;
+    return { ...rest, similarity_matrix: expandUpper(similarity_upper, n_texts) };
   },
 
   // Get available models
@@ -88,6 +109,12 @@ export const apiService = {
     const response = await apiClient.post("/analyze/detailed", request);
     return response.data;
   },
+
+  // Get plagiarized pairs only (no similarity matrix)
+  async getPairsAnalysis(request: AnalyzeRequest): Promise<unknown> {
+    const response = await apiClient.post("/analyze/pairs", request);
+    return response.data;
+  },
 };
 
 export default apiService;
@@ -22,6 +22,13 @@ export interface AnalyzeResponse {
   execution_time: number;
 }
 
+// Compact /analyze response: upper triangle of the similarity matrix only
+export interface AnalyzeCompactResponse
+  extends Omit<AnalyzeResponse, "similarity_matrix"> {
+  similarity_upper: number[];
+  n_texts: number;
+}
+
 export interface ModelDescription {
   name: string;
   description: string;